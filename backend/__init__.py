@@ -0,0 +1 @@
+"""Backend package for the restaurant recommendation API."""
@@ -0,0 +1,60 @@
+"""
+Offline cache prewarmer using Gemini Batch Mode.
+
+Generates one recommendation per mood for a target location through the
+Batch API (50% cheaper, far higher rate limits than synchronous calls)
+and writes them to a JSON file that the server loads into its response
+cache at startup via utils.load_prewarmed_cache().
+
+Usage:
+    python -m backend.batch_prewarm [--location "Atlanta, GA"] [--output prewarmed_recommendations.json]
+"""
+
+import argparse
+import json
+
+from .utils import batch_get_details
+
+# Mood categories offered by the frontend gallery
+MOODS = [
+    "adventurous",
+    "comforting",
+    "energizing",
+    "romantic",
+    "cozy",
+    "festive",
+    "indulgent",
+    "refreshing",
+]
+
+def main():
+    """
+    Submits a prewarm batch job and writes results to the output file.
+    """
+    arg_parser = argparse.ArgumentParser(description="Prewarm the recommendation cache via Gemini Batch Mode")
+    arg_parser.add_argument("--location", default="Atlanta, GA", help="Location to generate recommendations for")
+    arg_parser.add_argument("--output", default="prewarmed_recommendations.json", help="Output JSON file path")
+    args = arg_parser.parse_args()
+
+    rows = [{"mood": mood, "location": args.location} for mood in MOODS]
+    print(f"Submitting batch job for {len(rows)} moods in {args.location}...")
+    results = batch_get_details(rows)
+
+    entries = []
+    for i, row in enumerate(rows):
+        text = results.get(f"rec_{i}")
+        if text is None:
+            print(f"No result for mood '{row['mood']}', skipping")
+            continue
+        entries.append({
+            "mood": row["mood"],
+            "location": row["location"],
+            "recommendation": text,
+        })
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(entries, f, ensure_ascii=False, indent=2)
+    print(f"Wrote {len(entries)} prewarmed recommendations to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -9,56 +9,148 @@ The server uses Google Gemini AI for generating detailed restaurant information
 and Facebook's NLLB model for multilingual translation support.
 """
 
+from collections import deque
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-import sys
+import asyncio
+import json
 import os
+import threading
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils import (
-    load_parquet_from_huggingface, 
-    recommend_restaurant_by_mood_content, 
-    get_details_from_llm, 
-    translate, 
-    REPO_ID, 
+from .utils import (
+    load_parquet_from_huggingface,
+    load_or_build_mood_index,
+    load_mood_index_arrow,
+    get_last_parquet_path,
+    recommend_from_index,
+    aget_details_from_llm,
+    format_restaurant_details,
+    BatchTranslator,
+    build_recommendation_prompt,
+    make_cache_key,
+    cache_get,
+    cache_set,
+    load_prewarmed_cache,
+    get_llm,
+    REPO_ID,
     FILE_NAME
 )
 
-# Initialize FastAPI application
-app = FastAPI(
-    title="Restaurant Recommendation API",
-    description="AI-powered restaurant recommendations based on mood",
-    version="1.0.0"
-)
-
-# Configure CORS middleware to allow requests from any origin
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allow requests from any origin
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# When enabled, /recommend picks restaurants from the reviews dataset
+# (deterministic source) instead of asking Gemini to invent one
+USE_DATASET = os.getenv("USE_DATASET", "").lower() in ("1", "true", "yes")
 
-# Global variable to cache dataset
+# Global variables to cache dataset and its precomputed mood index
 customer_reviews_df = None
+mood_index = None
+
+# Coalesces concurrent /translate requests into shared model batches
+batch_translator = BatchTranslator()
+
+# Names of recently recommended restaurants, used to reject repeats
+# without polluting the (cacheable) prompt prefix
+recent_recommendations = deque(maxlen=10)
+
+def extract_restaurant_name(details):
+    """
+    Pulls the restaurant name out of a formatted recommendation.
+
+    Args:
+        details (str): Formatted recommendation text
+
+    Returns:
+        str or None: Restaurant name from the summary line, if present
+    """
+    for line in details.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("📝 Summary:"):
+            summary = stripped.split(":", 1)[1].strip()
+            return summary.split(" - ", 1)[0].strip() or None
+    return None
+
+# Serializes dataset loading so the lifespan prefetch thread and a
+# request-path retry can't both run the download and index build
+_dataset_lock = threading.Lock()
 
 def get_dataset():
     """Lazy load dataset only when needed"""
-    global customer_reviews_df
-    if customer_reviews_df is None:
+    global customer_reviews_df, mood_index
+    with _dataset_lock:
+        return _get_dataset_locked()
+
+def _get_dataset_locked():
+    """Loads the dataset and mood index; callers must hold _dataset_lock."""
+    global customer_reviews_df, mood_index
+    if mood_index is None:
+        # A prebuilt Arrow index bundled with the image makes the
+        # parquet download and groupby unnecessary entirely
+        mood_index = load_mood_index_arrow()
+        if mood_index is not None:
+            print(f"Loaded prebuilt mood index ({len(mood_index)} moods)")
+            return customer_reviews_df
+    if customer_reviews_df is None and mood_index is None:
         try:
             print("Loading dataset...")
             customer_reviews_df = load_parquet_from_huggingface(REPO_ID, FILE_NAME, max_rows=1000)
             if customer_reviews_df is None:
                 print("Dataset failed to load")
+            else:
+                # Precompute the mood -> top restaurants index once so
+                # per-request lookups are O(1); reuses the persisted
+                # index when the parquet file has not changed
+                mood_index = load_or_build_mood_index(customer_reviews_df, get_last_parquet_path())
         except Exception as e:
             print(f"Dataset loading error: {e}")
             customer_reviews_df = None
     return customer_reviews_df
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan handler.
+
+    Seeds the response cache with batch-generated recommendations and
+    prefetches the dataset in a background thread so the first request
+    never stalls on the Hugging Face download.
+    """
+    load_prewarmed_cache()
+    batch_translator.start()
+    prefetch_task = asyncio.create_task(asyncio.to_thread(get_dataset))
+    app.state.prefetch_task = prefetch_task
+    yield
+    batch_translator.stop()
+    if not prefetch_task.done():
+        prefetch_task.cancel()
+
+def create_app():
+    """
+    Builds and configures the FastAPI application.
+
+    Returns:
+        FastAPI: Application with lifespan and CORS middleware configured
+    """
+    app = FastAPI(
+        title="Restaurant Recommendation API",
+        description="AI-powered restaurant recommendations based on mood",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+
+    # Configure CORS middleware to allow requests from any origin
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Allow requests from any origin
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    return app
+
+app = create_app()
+
 class MoodRequest(BaseModel):
     """
     Request model for mood-based restaurant recommendations.
@@ -66,9 +158,12 @@ class MoodRequest(BaseModel):
     Attributes:
         mood (str): Selected mood category (e.g., 'adventurous', 'romantic')
         location (str, optional): User's location (city, state or coordinates)
+        stream (bool, optional): Stream the recommendation as server-sent
+            events instead of returning one JSON response
     """
     mood: str
     location: str = "Atlanta, GA"  # Default location
+    stream: bool = False
 
 class TranslateRequest(BaseModel):
     """
@@ -103,30 +198,76 @@ async def get_recommendation(request: MoodRequest):
     try:
         user_selected_mood = request.mood.lower()
         user_location = request.location
-        
-        # Generate restaurant recommendation directly with AI
-        from langchain_google_genai.chat_models import ChatGoogleGenerativeAI
-        from utils import GEMINI_MODEL, GEMINI_API_KEY
-        
-        import random
-        random_seed = random.randint(1, 1000)
-        
-        llm = ChatGoogleGenerativeAI(model=GEMINI_MODEL, google_api_key=GEMINI_API_KEY, temperature=0.9)
-        prompt = f"""Find a different highly-rated (4-5 star) restaurant in {user_location} that matches a {user_selected_mood} mood. Choose randomly from available options (seed: {random_seed}). 
-        Provide ONLY this exact format with no introduction:
-        📝 Summary: [Restaurant Name - brief description of cuisine/atmosphere, no address]
-        📞 Phone: [phone number]
-        📍 Address: [full street address]
-        😊 Moods: {user_selected_mood.title()}
-        ✅ Highlight: [key unique feature or specialty]
-        ⭐ Rating: [rating and review info]
-        🕒 Hours: [operating hours]
-        💰 Price: [price range like $$$ or $15-25 per person]
-        🍽️ Popular Items: [specific popular dishes]"""
-        
-        response = llm.invoke(prompt)
-        formatted_details = response.content
-        
+
+        # Return cached recommendation for repeated (mood, location) requests
+        cache_key = make_cache_key("recommend", user_selected_mood, user_location)
+        cached_details = cache_get(cache_key)
+        if cached_details is not None:
+            return {"recommendation": cached_details}
+
+        # Dataset-backed path: pick a real restaurant from the reviews
+        # dataset and only use Gemini to fill in its details
+        if USE_DATASET:
+            # Wait for the lifespan prefetch rather than loading inline;
+            # if it already finished without an index (failed load), retry
+            # the load in a worker thread so the event loop never blocks
+            # on the download or its sleep-and-retry loop
+            prefetch_task = getattr(app.state, "prefetch_task", None)
+            if prefetch_task is not None and not prefetch_task.done():
+                await prefetch_task
+            if mood_index is None:
+                await asyncio.to_thread(get_dataset)
+            recommendation = None
+            if mood_index is not None:
+                recommendation = recommend_from_index(mood_index, user_selected_mood)
+            if recommendation is not None:
+                details = await aget_details_from_llm(
+                    recommendation["business_name"],
+                    recommendation["city"],
+                    recommendation["address"],
+                )
+                formatted_details = format_restaurant_details(details, user_selected_mood.title())
+                cache_set(cache_key, formatted_details)
+                return {"recommendation": formatted_details}
+            # Fall through to the pure-LLM path if the dataset or the
+            # mood lookup is unavailable
+
+        # Generate restaurant recommendation directly with AI using the
+        # shared high-temperature client; the fixed prompt stays
+        # cacheable on Gemini's side, and variety comes from sampling
+        prompt = build_recommendation_prompt(user_selected_mood, user_location)
+
+        # Streaming path: emit tokens as server-sent events so the
+        # client renders the first line in ~200ms instead of waiting
+        # for the full completion; the finished text is still cached
+        if request.stream:
+            async def stream_recommendation():
+                chunks = []
+                async for chunk in get_llm(0.9, top_p=0.95).astream(prompt):
+                    if not chunk.content:
+                        continue
+                    chunks.append(chunk.content)
+                    yield f"data: {json.dumps(chunk.content)}\n\n"
+                full_details = "".join(chunks)
+                restaurant_name = extract_restaurant_name(full_details)
+                if restaurant_name:
+                    recent_recommendations.append(restaurant_name)
+                cache_set(cache_key, full_details)
+                yield "data: [DONE]\n\n"
+            return StreamingResponse(stream_recommendation(), media_type="text/event-stream")
+
+        # Retry a couple of times if the model repeats a recent pick
+        formatted_details = None
+        for _ in range(3):
+            response = await get_llm(0.9, top_p=0.95).ainvoke(prompt)
+            formatted_details = response.content
+            restaurant_name = extract_restaurant_name(formatted_details)
+            if restaurant_name is None or restaurant_name not in recent_recommendations:
+                if restaurant_name:
+                    recent_recommendations.append(restaurant_name)
+                break
+
+        cache_set(cache_key, formatted_details)
         return {"recommendation": formatted_details}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -149,20 +290,38 @@ async def translate_text(request: TranslateRequest):
         HTTPException: If translation fails or language not supported
     """
     try:
-        translated_text = translate(request.text, request.language)
+        # Return cached translation for repeated (text, language) requests
+        cache_key = make_cache_key("translate", request.text, request.language)
+        translated_text = cache_get(cache_key)
+        if translated_text is None:
+            # Queue onto the micro-batcher so concurrent requests share
+            # one model batch; the call never blocks the event loop
+            translated_text = await batch_translator.translate(request.text, request.language)
+            cache_set(cache_key, translated_text)
         return {"translated_text": translated_text}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
     """
-    Run the FastAPI server when script is executed directly.
-    
+    Run the FastAPI server (python -m backend.main from the repo root).
+
     Server configuration:
     - Host: 0.0.0.0 (accessible from all network interfaces)
-    - Port: from environment variable or 8000 default
-    - Auto-reload enabled for development
+    - Port: from environment variable or 8080 default
+    - Workers: WEB_CONCURRENCY or one per CPU core
+    - uvloop event loop and httptools HTTP parser (both ship with
+      uvicorn[standard]) for higher per-process concurrency
     """
     import uvicorn
     port = int(os.getenv("PORT", 8080))
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    uvicorn.run(
+        "backend.main:app",
+        host="0.0.0.0",
+        port=port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+    )
\ No newline at end of file
@@ -15,24 +15,130 @@ from langchain.output_parsers import PydanticOutputParser
 from pydantic import Field, BaseModel
 # from transformers import pipeline  # Removed to reduce memory usage
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from huggingface_hub import hf_hub_download
+import asyncio
+import functools
+import hashlib
 import os
 import random
+import re
+import time
+
+from . import nllb_model
 
 # Load environment variables (optional for local development)
 dotenv_path = find_dotenv()
 if dotenv_path:
     load_dotenv(dotenv_path)
 
+# Use the Rust downloader for Hugging Face files when available; it
+# splits the download into parallel range requests, which is 3-5x
+# faster than the default single HTTP stream
+try:
+    import hf_transfer  # noqa: F401
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+except ImportError:
+    pass
+
 # Configuration constants
 GEMINI_MODEL = "gemini-2.0-flash"
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 REPO_ID = os.getenv("REPO_ID")
 FILE_NAME = os.getenv("FILE_NAME")
 
+# Only these dataset columns are used by the recommendation logic;
+# projecting them at read time skips decoding everything else
+DATASET_COLUMNS = ["mood", "user_id", "review_stars", "business_name", "address", "city", "review"]
+
+# Where the derived mood index is persisted between process restarts
+MOOD_INDEX_CACHE_FILE = os.getenv("MOOD_INDEX_CACHE_FILE", "/tmp/mood_index.pkl")
+
+# Prebuilt mood index shipped with the image (see backend/build_index.py);
+# loading it replaces the parquet download + groupby on cold start
+MOOD_INDEX_ARROW_FILE = os.getenv("MOOD_INDEX_ARROW_FILE", "mood_index.arrow")
+
 if not GEMINI_API_KEY:
     raise ValueError("GEMINI_API_KEY is missing! Check your .env file.")
 
+@functools.cache
+def get_llm(temperature, top_p=None):
+    """
+    Returns the shared Gemini client for a sampling configuration.
+
+    Constructed lazily on first use and cached, so each worker only pays
+    the memory and setup cost for the clients its endpoints actually
+    touch, while HTTP connection pools are still reused across requests.
+
+    Args:
+        temperature (float): Sampling temperature
+        top_p (float, optional): Nucleus sampling threshold
+
+    Returns:
+        ChatGoogleGenerativeAI: Cached client instance
+    """
+    kwargs = {"model": GEMINI_MODEL, "google_api_key": GEMINI_API_KEY, "temperature": temperature}
+    if top_p is not None:
+        kwargs["top_p"] = top_p
+    return ChatGoogleGenerativeAI(**kwargs)
+
+# Response cache configuration
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", 3600))
+CACHE_MAX_ENTRIES = 4096
+
+# In-process cache mapping request keys to (value, expiry timestamp) pairs.
+# Avoids a 0.5-5s Gemini round-trip for repeated identical requests.
+_response_cache = {}
+
+def make_cache_key(*parts):
+    """
+    Builds a stable cache key from the given request parameters.
+
+    Args:
+        *parts: Request parameters to include in the key (e.g., mood, location)
+
+    Returns:
+        str: SHA-1 hex digest uniquely identifying the parameter combination
+    """
+    joined = "|".join(str(part) for part in parts)
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()
+
+def cache_get(key):
+    """
+    Retrieves a cached response if present and not expired.
+
+    Args:
+        key (str): Cache key from make_cache_key()
+
+    Returns:
+        Cached value, or None if missing or expired
+    """
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+    value, expires_at = entry
+    if time.time() > expires_at:
+        _response_cache.pop(key, None)
+        return None
+    return value
+
+def cache_set(key, value):
+    """
+    Stores a response in the cache with the configured TTL.
+
+    Evicts the entry closest to expiry when the cache is full.
+
+    Args:
+        key (str): Cache key from make_cache_key()
+        value: Response value to cache
+    """
+    if len(_response_cache) >= CACHE_MAX_ENTRIES:
+        oldest_key = min(_response_cache, key=lambda k: _response_cache[k][1])
+        _response_cache.pop(oldest_key, None)
+    _response_cache[key] = (value, time.time() + CACHE_TTL_SECONDS)
+
 class restaurant_detail(BaseModel):
     """
     Pydantic model for structured restaurant information.
@@ -58,21 +164,60 @@ class restaurant_detail(BaseModel):
     price: str
     popular_items: str
 
-def setup_prompt_template(query):
+# Precompiled output parser and its format instructions; both are
+# constant per process, so build them once rather than per request
+PARSER = PydanticOutputParser(pydantic_object=restaurant_detail)
+INSTRUCTIONS = PARSER.get_format_instructions()
+
+def build_recommendation_prompt(mood, location):
     """
-    Creates a prompt template for restaurant information queries.
-    
+    Builds the Gemini prompt used for mood-based recommendations.
+
+    Shared between the live /recommend endpoint and offline batch
+    generation so both produce identically formatted output. The prompt
+    is deterministic per (mood, location) — output variety comes from
+    sampling (temperature/top_p), keeping the prefix eligible for
+    Gemini's implicit prompt caching discounts.
+
     Args:
-        query (str): The restaurant query string
-        
+        mood (str): Selected mood category (lowercase)
+        location (str): User's location (city, state)
+
     Returns:
-        PromptTemplate: Configured prompt template for LLM
+        str: Formatted prompt string
     """
-    format = """You are a world famous restaurant expert. ...
+    return f"""Find a different highly-rated (4-5 star) restaurant in {location} that matches a {mood} mood. Choose randomly from available options.
+        Provide ONLY this exact format with no introduction:
+        📝 Summary: [Restaurant Name - brief description of cuisine/atmosphere, no address]
+        📞 Phone: [phone number]
+        📍 Address: [full street address]
+        😊 Moods: {mood.title()}
+        ✅ Highlight: [key unique feature or specialty]
+        ⭐ Rating: [rating and review info]
+        🕒 Hours: [operating hours]
+        💰 Price: [price range like $$$ or $15-25 per person]
+        🍽️ Popular Items: [specific popular dishes]"""
+
+# Built once at import; the template text does not vary per query
+_RESTAURANT_PROMPT_TEMPLATE = PromptTemplate(
+    input_variables=["query"],
+    template="""You are a world famous restaurant expert. ...
     Question: {query}
     Answer: ... (format)
     """
-    return PromptTemplate(input_variables=["query"], template=format)
+)
+
+def setup_prompt_template(query):
+    """
+    Returns the prompt template for restaurant information queries.
+
+    Args:
+        query (str): The restaurant query string
+
+    Returns:
+        PromptTemplate: Configured prompt template for LLM
+    """
+    return _RESTAURANT_PROMPT_TEMPLATE
 
 def get_details_from_llm(restaurant_name, restaurant_city, restaurant_street):
     """
@@ -88,47 +233,77 @@ def get_details_from_llm(restaurant_name, restaurant_city, restaurant_street):
     """
     query = f"Give me the details of {restaurant_name} in {restaurant_city} on {restaurant_street}"
     prompt_template = setup_prompt_template(query)
-    parser = PydanticOutputParser(pydantic_object=restaurant_detail)
-    instructions = parser.get_format_instructions()
-    query += "\n\n" + instructions
-    llm = ChatGoogleGenerativeAI(model=GEMINI_MODEL, google_api_key=GEMINI_API_KEY, temperature=0.3)
-    response = (prompt_template | llm).invoke(query)
-    data = parser.parse(response.content)
+    query += "\n\n" + INSTRUCTIONS
+    response = (prompt_template | get_llm(0.3)).invoke(query)
+    data = PARSER.parse(response.content)
+    return data
+
+async def aget_details_from_llm(restaurant_name, restaurant_city, restaurant_street):
+    """
+    Async variant of get_details_from_llm for use inside async handlers.
+
+    Awaits the Gemini call instead of blocking the event loop, and runs
+    the output parsing in a worker thread.
+
+    Args:
+        restaurant_name (str): Name of the restaurant
+        restaurant_city (str): City where restaurant is located
+        restaurant_street (str): Street address of restaurant
+
+    Returns:
+        restaurant_detail: Structured restaurant information
+    """
+    query = f"Give me the details of {restaurant_name} in {restaurant_city} on {restaurant_street}"
+    prompt_template = setup_prompt_template(query)
+    query += "\n\n" + INSTRUCTIONS
+    response = await (prompt_template | get_llm(0.3)).ainvoke(query)
+    data = await asyncio.to_thread(PARSER.parse, response.content)
     return data
 
+# Response template for formatted restaurant details, compiled once at
+# import; field names match the restaurant_detail model
+_DETAILS_TEMPLATE = """📝 Summary: {summary}
+📞 Phone: {phone}
+📍 Address: {address}
+😊 Moods: {mood}
+✅ Highlight: {highlight}
+⭐ Rating: {rating}
+🕒 Hours: {hours}
+💰 Price: {price}
+🍽️ Popular Items: {popular_items}
+"""
+
 def format_restaurant_details(data, mood):
     """
     Formats restaurant details into a structured string format.
-    
+
     Args:
         data (restaurant_detail): Restaurant information object
         mood (str): Selected mood category
-        
+
     Returns:
         str: Formatted restaurant details string
     """
-    return f"""📝 Summary: {data.summary}
-📞 Phone: {data.phone}
-📍 Address: {data.address}
-😊 Moods: {mood}
-✅ Highlight: {data.highlight}
-⭐ Rating: {data.rating}
-🕒 Hours: {data.hours}
-💰 Price: {data.price}
-🍽️ Popular Items: {data.popular_items}
-"""
+    return _DETAILS_TEMPLATE.format(mood=mood, **data.model_dump())
+
+# Matches model preambles like "Here's the translation:" so they can be
+# stripped in a single anchored pass; covers common phrasing variants
+_TRANSLATION_PREAMBLE = re.compile(r"^\s*Here(?:'s| is) the translation[^:\n]*:\s*", re.IGNORECASE)
 
 def translate(input_text, target_language):
     """
-    Translates text to specified target language using Google Gemini.
-    
+    Translates text to the specified target language.
+
+    Uses the local NLLB model when configured (sub-second, no API cost),
+    falling back to Google Gemini otherwise.
+
     Args:
         input_text (str): Text to translate
         target_language (str): Target language (Spanish, French, German, Romanian)
-        
+
     Returns:
         str: Translated text
-        
+
     Raises:
         ValueError: If target language is not supported
     """
@@ -136,44 +311,325 @@ def translate(input_text, target_language):
     if target_language not in supported_languages:
         raise ValueError(f"Language {target_language} not supported!")
 
-    llm = ChatGoogleGenerativeAI(model=GEMINI_MODEL, google_api_key=GEMINI_API_KEY, temperature=0.1)
+    if nllb_model.is_available():
+        return nllb_model.translate_batch([input_text], target_language)[0]
+
     prompt = f"Translate the following text to {target_language}. Return ONLY the translated text with the same formatting and structure, no introduction:\n\n{input_text}"
-    
-    response = llm.invoke(prompt)
-    # Remove any introductory text
-    content = response.content
-    if "Here's the translation" in content:
-        content = content.split("Here's the translation", 1)[1]
-        content = content.split(":", 1)[1] if ":" in content else content
-        content = content.strip()
+
+    response = get_llm(0.1).invoke(prompt)
+    # Remove any introductory text in one anchored pass
+    content = _TRANSLATION_PREAMBLE.sub("", response.content, count=1)
     return content
 
-def load_parquet_from_huggingface(repo_id, filename, max_rows=1000):
+class BatchTranslator:
+    """
+    Coalesces concurrent translation requests into shared batches.
+
+    Requests arriving within max_wait_ms of each other (up to max_batch)
+    are drained from a queue and translated together: a single NLLB
+    forward pass when the local model is configured, otherwise
+    thread-pooled Gemini calls issued concurrently. Each caller awaits a
+    Future resolved with its own result.
+    """
+
+    def __init__(self, max_batch=32, max_wait_ms=10):
+        """
+        Args:
+            max_batch (int): Maximum requests per shared batch
+            max_wait_ms (int): How long to wait for more requests to
+                join a batch before dispatching it
+        """
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self._worker_task = None
+
+    def start(self):
+        """Starts the background batching worker (call from the app lifespan)."""
+        if self._worker_task is None:
+            self._worker_task = asyncio.create_task(self._worker())
+
+    def stop(self):
+        """Stops the background batching worker."""
+        if self._worker_task is not None:
+            self._worker_task.cancel()
+            self._worker_task = None
+
+    async def translate(self, text, language):
+        """
+        Queues a translation and waits for its batched result.
+
+        Args:
+            text (str): Text to translate
+            language (str): Target language name
+
+        Returns:
+            str: Translated text
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((text, language, future))
+        return await future
+
+    async def _worker(self):
+        """Drains the queue into batches and dispatches them forever."""
+        while True:
+            items = [await self.queue.get()]
+            # Wait briefly so concurrent arrivals can share the batch
+            deadline = asyncio.get_running_loop().time() + self.max_wait
+            while len(items) < self.max_batch:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._process(items)
+
+    async def _process(self, items):
+        """Translates one drained batch and resolves each caller's Future."""
+        # Group by target language; each group is one model batch
+        by_language = {}
+        for text, language, future in items:
+            by_language.setdefault(language, []).append((text, future))
+
+        for language, entries in by_language.items():
+            texts = [text for text, _ in entries]
+            try:
+                if nllb_model.is_available():
+                    results = await asyncio.to_thread(nllb_model.translate_batch, texts, language)
+                else:
+                    results = await asyncio.gather(
+                        *[asyncio.to_thread(translate, text, language) for text in texts]
+                    )
+                for (_, future), result in zip(entries, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                for _, future in entries:
+                    if not future.done():
+                        future.set_exception(e)
+
+def batch_generate(prompts, poll_interval=60, timeout=24 * 3600):
+    """
+    Generates responses for many prompts via the Gemini Batch API.
+
+    Batch Mode is half the price of synchronous calls and has much higher
+    rate limits, at the cost of latency (results within 24h). Use it for
+    offline pipelines (nightly prewarm, bulk translation), never for
+    latency-sensitive request traffic.
+
+    Args:
+        prompts (dict): Mapping of result key to prompt text
+        poll_interval (int): Seconds between job status polls
+        timeout (int): Maximum seconds to wait for the job to finish
+
+    Returns:
+        dict: Mapping of result key to generated text (failed entries omitted)
+
+    Raises:
+        RuntimeError: If the batch job fails or times out
+    """
+    import json
+    import tempfile
+    from google import genai  # imported here so the server never pays for it
+
+    client = genai.Client(api_key=GEMINI_API_KEY)
+
+    # Build the JSONL request file expected by Batch Mode
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False) as f:
+        for key, prompt in prompts.items():
+            request = {
+                "key": key,
+                "request": {"contents": [{"parts": [{"text": prompt}]}]},
+            }
+            f.write(json.dumps(request) + "\n")
+        jsonl_path = f.name
+
+    try:
+        uploaded = client.files.upload(
+            file=jsonl_path,
+            config={"mime_type": "application/jsonl"},
+        )
+        job = client.batches.create(
+            model=GEMINI_MODEL,
+            src=uploaded.name,
+            config={"display_name": "restaurant-recommendation-batch"},
+        )
+
+        # Poll until the job reaches a terminal state
+        deadline = time.time() + timeout
+        terminal_states = {
+            "JOB_STATE_SUCCEEDED",
+            "JOB_STATE_FAILED",
+            "JOB_STATE_CANCELLED",
+            "JOB_STATE_EXPIRED",
+        }
+        while job.state.name not in terminal_states:
+            if time.time() > deadline:
+                raise RuntimeError(f"Batch job {job.name} timed out")
+            time.sleep(poll_interval)
+            job = client.batches.get(name=job.name)
+
+        if job.state.name != "JOB_STATE_SUCCEEDED":
+            raise RuntimeError(f"Batch job {job.name} ended in state {job.state.name}")
+
+        # Parse the JSONL result file back into a key -> text mapping
+        result_bytes = client.files.download(file=job.dest.file_name)
+        results = {}
+        for line in result_bytes.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            try:
+                text = entry["response"]["candidates"][0]["content"]["parts"][0]["text"]
+                results[entry["key"]] = text
+            except (KeyError, IndexError):
+                print(f"Batch entry {entry.get('key')} returned no text, skipping")
+        return results
+    finally:
+        os.unlink(jsonl_path)
+
+def batch_get_details(rows, poll_interval=60, timeout=24 * 3600):
+    """
+    Generates restaurant detail responses for many rows via Batch Mode.
+
+    Args:
+        rows (list[dict]): Rows with 'mood' and 'location' keys
+        poll_interval (int): Seconds between job status polls
+        timeout (int): Maximum seconds to wait for the job to finish
+
+    Returns:
+        dict: Mapping of "rec_{i}" keys to generated recommendation text
+    """
+    prompts = {
+        f"rec_{i}": build_recommendation_prompt(row["mood"].lower(), row["location"])
+        for i, row in enumerate(rows)
+    }
+    return batch_generate(prompts, poll_interval=poll_interval, timeout=timeout)
+
+def load_prewarmed_cache(path=None):
+    """
+    Loads batch-generated recommendations into the response cache.
+
+    Reads the JSON file written by batch_prewarm.py so repeated
+    (mood, location) requests are served from cache immediately after
+    startup instead of waiting on a live Gemini call.
+
+    Args:
+        path (str, optional): Path to the prewarm file. Defaults to the
+            PREWARM_FILE environment variable or "prewarmed_recommendations.json"
+
+    Returns:
+        int: Number of entries loaded into the cache
+    """
+    import json
+
+    path = path or os.getenv("PREWARM_FILE", "prewarmed_recommendations.json")
+    if not os.path.exists(path):
+        return 0
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Failed to read prewarm file {path}: {e}")
+        return 0
+    for entry in entries:
+        key = make_cache_key("recommend", entry["mood"], entry["location"])
+        cache_set(key, entry["recommendation"])
+    print(f"Loaded {len(entries)} prewarmed recommendations from {path}")
+    return len(entries)
+
+# Cache of opened ParquetFile handles so footer metadata is parsed once
+# per process instead of on every (re)load attempt
+_parquet_file_cache = {}
+
+# Cache of pyarrow dataset handles used for filtered (pushdown) reads
+_parquet_dataset_cache = {}
+
+# Path of the most recently downloaded parquet file, used to fingerprint
+# the persisted mood index
+_last_parquet_path = None
+
+def get_last_parquet_path():
+    """
+    Returns the local path of the most recently downloaded parquet file.
+
+    Returns:
+        str or None: File path, or None if no download has completed
+    """
+    return _last_parquet_path
+
+def load_parquet_from_huggingface(repo_id, filename, max_rows=1000, moods=None):
     """
     Downloads and loads a limited parquet dataset from Hugging Face Hub.
-    
+
+    Reads only the columns the recommender uses and stops after enough
+    row batches to satisfy max_rows, instead of decoding the full file
+    and throwing most of it away. When a mood filter is given, the
+    filter is pushed down into the parquet reader so row groups whose
+    min/max stats cannot match are skipped before decoding.
+
     Args:
         repo_id (str): Hugging Face repository ID
         filename (str): Name of the parquet file
         max_rows (int): Maximum number of rows to load
-        
+        moods (list[str], optional): Restrict rows to these moods via
+            row-group predicate pushdown
+
     Returns:
         pd.DataFrame or None: Loaded dataset or None if failed
     """
-    import time
+    global _last_parquet_path
     for attempt in range(3):
         try:
             print(f"Download attempt {attempt + 1}/3...")
             file_path = hf_hub_download(
-                repo_id=repo_id, 
-                filename=filename, 
+                repo_id=repo_id,
+                filename=filename,
                 repo_type="dataset",
                 force_download=False
             )
-            # Read only first max_rows to save memory
-            df = pd.read_parquet(file_path, engine='pyarrow')
-            if len(df) > max_rows:
-                df = df.sample(n=max_rows, random_state=42)
+            _last_parquet_path = file_path
+
+            # Filtered path: let pyarrow prune row groups whose mood
+            # stats cannot match before anything is decompressed; the
+            # dataset handle is cached so metadata is parsed once
+            if moods is not None:
+                dset = _parquet_dataset_cache.get(file_path)
+                if dset is None:
+                    dset = ds.dataset(file_path, format="parquet")
+                    _parquet_dataset_cache[file_path] = dset
+                columns = [c for c in DATASET_COLUMNS if c in dset.schema.names]
+                table = dset.to_table(columns=columns, filter=ds.field("mood").isin(list(moods)))
+                df = table.slice(0, max_rows).to_pandas(types_mapper=pd.ArrowDtype)
+                print(f"Dataset loaded: {len(df)} rows (moods: {', '.join(moods)})")
+                return df
+
+            # Project needed columns and read only enough row batches
+            # to fill max_rows; reuse the parsed footer metadata across
+            # retries and reloads
+            pf = _parquet_file_cache.get(file_path)
+            if pf is None:
+                pf = pq.ParquetFile(file_path)
+                _parquet_file_cache[file_path] = pf
+            columns = [c for c in DATASET_COLUMNS if c in pf.schema_arrow.names]
+            batches = []
+            total_rows = 0
+            for batch in pf.iter_batches(batch_size=4096, columns=columns):
+                batches.append(batch)
+                total_rows += batch.num_rows
+                if total_rows >= max_rows:
+                    break
+            if batches:
+                table = pa.Table.from_batches(batches)
+                # Arrow-backed dtypes keep strings as contiguous UTF-8
+                # buffers instead of boxed Python objects, so the
+                # filter/groupby work in build_mood_index runs on
+                # vectorized Arrow kernels
+                df = table.slice(0, max_rows).to_pandas(types_mapper=pd.ArrowDtype)
+            else:
+                df = pd.DataFrame(columns=columns)
             print(f"Dataset loaded: {len(df)} rows")
             return df
         except Exception as e:
@@ -184,41 +640,185 @@ def load_parquet_from_huggingface(repo_id, filename, max_rows=1000):
                 print(f"All attempts failed to load dataset")
                 return None
 
+def build_mood_index(df, num_of_recommendations=5):
+    """
+    Precomputes top restaurant recommendations for every mood.
+
+    For each mood, finds the most active reviewer (the mood expert),
+    keeps their highest-rated reviews, and stores the top-scoring ones
+    as plain dicts so the request path never touches pandas.
+
+    Args:
+        df (pd.DataFrame): Restaurant reviews dataset
+        num_of_recommendations (int): Number of top recommendations to consider
+
+    Returns:
+        dict: Mapping of mood to list of recommendation dicts
+    """
+    # Create short review summaries in vectorized passes: only reviews
+    # longer than 50 characters are truncated and get an ellipsis
+    reviews = df["review"].astype("string")
+    long_mask = reviews.str.len() > 50
+    df = df.assign(short_review=reviews.mask(long_mask, reviews.str.slice(0, 50) + "..."))
+
+    index = {}
+    for mood, mood_matches in df.groupby("mood"):
+        # Find the most active reviewer for this mood (mood expert)
+        mood_expert_id = mood_matches["user_id"].value_counts().idxmax()
+        mood_expert_reviews = mood_matches[mood_matches["user_id"] == mood_expert_id]
+
+        # Select the top-rated recommendations without a full sort
+        top_recommendations = mood_expert_reviews.nlargest(num_of_recommendations, "review_stars")
+
+        # Keep only the highest-rated restaurants for this mood;
+        # nlargest returns rows in descending order
+        max_score = top_recommendations["review_stars"].iat[0]
+        top_scoring_restaurants = top_recommendations[top_recommendations["review_stars"] == max_score]
+        index[mood] = top_scoring_restaurants.to_dict("records")
+    return index
+
+def save_mood_index_arrow(index, path=None):
+    """
+    Writes a mood index to a compact Arrow IPC file.
+
+    The per-mood recommendation dicts are flattened into one table; the
+    'mood' column they already carry is enough to regroup them on load.
+
+    Args:
+        index (dict): Mapping of mood to list of recommendation dicts
+        path (str, optional): Output path. Defaults to MOOD_INDEX_ARROW_FILE
+    """
+    path = path or MOOD_INDEX_ARROW_FILE
+    records = [rec for recommendations in index.values() for rec in recommendations]
+    table = pa.Table.from_pylist(records)
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    print(f"Wrote mood index ({table.num_rows} rows) to {path}")
+
+def load_mood_index_arrow(path=None):
+    """
+    Loads a prebuilt mood index from an Arrow IPC file, if present.
+
+    The file is memory-mapped, so loading takes microseconds regardless
+    of size — no parquet download, decode, or groupby on cold start.
+
+    Args:
+        path (str, optional): Index path. Defaults to MOOD_INDEX_ARROW_FILE
+
+    Returns:
+        dict or None: Mapping of mood to list of recommendation dicts,
+            or None if the file is missing or unreadable
+    """
+    path = path or MOOD_INDEX_ARROW_FILE
+    if not os.path.exists(path):
+        return None
+    try:
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+    except (pa.ArrowInvalid, OSError) as e:
+        print(f"Ignoring unreadable mood index file {path}: {e}")
+        return None
+
+    index = {}
+    for rec in table.to_pylist():
+        index.setdefault(rec["mood"], []).append(rec)
+    return index
+
+def _file_fingerprint(path):
+    """
+    Builds a cheap change-detection fingerprint for a local file.
+
+    Args:
+        path (str): File path
+
+    Returns:
+        str: Fingerprint combining file size and modification time
+    """
+    stat = os.stat(path)
+    return f"{stat.st_size}-{int(stat.st_mtime)}"
+
+def load_or_build_mood_index(df, source_path=None, num_of_recommendations=5):
+    """
+    Returns the mood index, reusing a persisted copy when still valid.
+
+    The index is stored at MOOD_INDEX_CACHE_FILE fingerprinted by the
+    source parquet file, so process restarts skip the groupby rebuild
+    when the dataset has not changed.
+
+    Args:
+        df (pd.DataFrame): Restaurant reviews dataset
+        source_path (str, optional): Local parquet path used to
+            fingerprint the persisted index
+        num_of_recommendations (int): Number of top recommendations to consider
+
+    Returns:
+        dict: Mapping of mood to list of recommendation dicts
+    """
+    import pickle
+
+    fingerprint = None
+    if source_path and os.path.exists(source_path):
+        fingerprint = _file_fingerprint(source_path)
+        if os.path.exists(MOOD_INDEX_CACHE_FILE):
+            try:
+                with open(MOOD_INDEX_CACHE_FILE, "rb") as f:
+                    cached = pickle.load(f)
+                if cached.get("fingerprint") == fingerprint:
+                    print(f"Loaded mood index from {MOOD_INDEX_CACHE_FILE}")
+                    return cached["index"]
+            except Exception as e:
+                print(f"Ignoring unreadable mood index cache: {e}")
+
+    index = build_mood_index(df, num_of_recommendations)
+    if fingerprint:
+        try:
+            with open(MOOD_INDEX_CACHE_FILE, "wb") as f:
+                pickle.dump({"fingerprint": fingerprint, "index": index}, f)
+        except OSError as e:
+            print(f"Failed to persist mood index: {e}")
+    return index
+
+# Cache of the mood index built for the most recent dataset, keyed by
+# the DataFrame's id so a reloaded dataset triggers a rebuild
+_mood_index_cache = {}
+
 def recommend_restaurant_by_mood_content(df, mood, num_of_recommendations=5):
     """
     Recommends a restaurant based on mood using expert reviewer analysis.
-    
-    Finds the most active reviewer for the specified mood and selects their
-    highest-rated restaurant recommendation.
-    
+
+    The per-mood expert analysis is precomputed once per dataset by
+    build_mood_index, so each call is a dict lookup plus a random choice
+    instead of a full DataFrame scan.
+
     Args:
         df (pd.DataFrame): Restaurant reviews dataset
         mood (str): Target mood for recommendation
         num_of_recommendations (int): Number of top recommendations to consider
-        
+
     Returns:
-        pd.Series or None: Restaurant recommendation or None if no matches
+        dict or None: Restaurant recommendation or None if no matches
     """
-    mood_matches = df[df["mood"] == mood]
-    if mood_matches.empty:
+    mood_index = _mood_index_cache.get(id(df))
+    if mood_index is None:
+        mood_index = build_mood_index(df, num_of_recommendations)
+        _mood_index_cache.clear()
+        _mood_index_cache[id(df)] = mood_index
+
+    return recommend_from_index(mood_index, mood)
+
+def recommend_from_index(mood_index, mood):
+    """
+    Picks a recommendation for a mood from a prebuilt index.
+
+    Args:
+        mood_index (dict): Mapping of mood to list of recommendation dicts
+        mood (str): Target mood for recommendation
+
+    Returns:
+        dict or None: Restaurant recommendation or None if no matches
+    """
+    candidates = mood_index.get(mood)
+    if not candidates:
         return None
-    
-    # Find the most active reviewer for this mood (mood expert)
-    mood_expert_id = mood_matches["user_id"].value_counts().idxmax()
-    mood_expert_reviews = mood_matches[mood_matches["user_id"] == mood_expert_id].copy()
-    
-    # Create short review summaries
-    mood_expert_reviews["short_review"] = mood_expert_reviews["review"].apply(
-        lambda x: x[:50] + "..." if isinstance(x, str) and len(x) > 50 else x
-    )
-    
-    # Sort by rating and select top recommendations
-    mood_expert_reviews = mood_expert_reviews.sort_values(by="review_stars", ascending=False)
-    top_recommendations = mood_expert_reviews.head(num_of_recommendations)
-    
-    # Select randomly from highest-rated restaurants
-    max_score = top_recommendations["review_stars"].max()
-    top_scoring_restaurants = top_recommendations[top_recommendations["review_stars"] == max_score]
-    final_best = top_scoring_restaurants.sample(1, random_state=random.randint(1, 9999)).iloc[0]
-    
-    return final_best
\ No newline at end of file
+    return random.choice(candidates)
\ No newline at end of file